@@ -0,0 +1,39 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import src.config as config
+from src.solsystem_modell.forces import calculate_forces_parallel, calculate_row_tile_size, calculate_tile_forces
+
+
+def time_call(function, repeats):
+    function()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats
+
+
+def benchmark_forces(body_count=8192, repeats=3):
+    rng = np.random.default_rng(0)
+    positions = rng.uniform(-30 * config.AU, 30 * config.AU, (body_count, 2))
+    masses = rng.uniform(1e15, 1e27, body_count)
+    rows = np.arange(body_count)
+
+    serial_time = time_call(lambda: calculate_tile_forces(positions, masses, rows), repeats)
+    print(f'{body_count} bodies on {config.FORCE_WORKERS} cores, serial kernel: {serial_time:.3f} s')
+
+    workers = 1
+    while workers <= config.FORCE_WORKERS:
+        row_tile_size = calculate_row_tile_size(body_count, workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            parallel_time = time_call(lambda: calculate_forces_parallel(positions, masses, executor,
+                                                                        row_tile_size=row_tile_size), repeats)
+        print(f'{workers:3d} workers, {-(-body_count // row_tile_size):4d} tiles: {parallel_time:.3f} s, '
+              f'speedup {serial_time / parallel_time:.2f}x')
+        workers *= 2
+
+
+if __name__ == '__main__':
+    benchmark_forces()
@@ -1,3 +1,5 @@
+import os
+
 # Simulation Dimensions
 SIMULATION_WIDTH: int = 1100
 SIMULATION_HEIGHT: int = 800
@@ -12,8 +14,25 @@ MAX_SIMULATION_YEARS: int = 3000  # Automatically stops the simulation after thi
 TIME_ACCELERATION: int = int(1e6)  # default = 1e6
 START_DATE = '1730-01-01'
 
+# Force evaluation
+FORCE_WORKERS: int = os.cpu_count() or 1
+FORCE_TILE_SIZE: int = 256  # Largest number of rows or columns in one force tile
+MIN_FORCE_TILE_SIZE: int = 32  # Smallest number of rows in one force tile
+FORCE_TILES_PER_WORKER: int = 4  # Row tiles queued per worker, so faster workers pick up the remaining tiles
+# Number of celestial bodies from which the forces are evaluated in parallel, chosen so every worker gets its tiles
+PARALLEL_FORCE_THRESHOLD: int = FORCE_WORKERS * FORCE_TILES_PER_WORKER * MIN_FORCE_TILE_SIZE
+
+# Block timesteps
+USE_BLOCK_TIMESTEPS: bool = False  # Steps each celestial body with a power-of-two fraction of the frame step
+MAX_TIMESTEP_LEVEL: int = 6  # The smallest step is the frame step divided by 2 ** MAX_TIMESTEP_LEVEL
+TIMESTEP_ACCURACY: float = 0.01  # Fraction of a celestial body's acceleration / jerk used as its step
+
+# Event detection
+EVENT_TIME_TOLERANCE: float = 60.0  # Seconds of simulation time to which event times are refined
+
 # File Paths
 DATA_FILE_PATH_ROOT: str = 'data/'
+OUTPUT_FILE_PATH_ROOT: str = 'output/'
 
 # Colors
 WHITE: tuple[int, int, int] = (255, 255, 255)
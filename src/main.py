@@ -1,7 +1,9 @@
-import numpy as np
+import os
+
 import pygame
 
 import config as config
+from src.solsystem_modell.events import EventDetector
 from src.solsystem_modell.plotter import plot_data
 from src.solsystem_modell.renderer import Renderer
 from src.solsystem_modell.simulation import Simulation
@@ -9,6 +11,9 @@ from src.collect_planet_data import collect_planet_data
 from src.merge_new_planet_data_with_old import merge_new_planet_data
 
 
+DATA_FILES = ['solsystem_data.csv', 'solsystem_data_uten_neptun.csv']
+
+
 def handle_events() -> bool:
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
@@ -20,12 +25,30 @@ def initialize_simulations() -> tuple:
     simulations = [Simulation() for _ in range(2)]
     renderers = [Renderer(sim) for sim in simulations]
 
-    for sim, data_file in zip(simulations, ['solsystem_data.csv', 'solsystem_data_uten_neptun.csv']):
+    for sim, data_file in zip(simulations, DATA_FILES):
         sim.initialize_simulation(config.DATA_FILE_PATH_ROOT + data_file)
 
     return simulations, renderers
 
 
+def initialize_event_detectors(simulations) -> list:
+    detectors = []
+    for sim in simulations:
+        detector = EventDetector(sim)
+        detector.add_apsides('Uranus')
+        if sim.get_planet_position('Neptune') is not None:
+            detector.add_close_approach('Uranus', 'Neptune')
+            detector.add_conjunction('Uranus', 'Neptune')
+        detectors.append(detector)
+    return detectors
+
+
+def write_events(detectors) -> None:
+    os.makedirs(config.OUTPUT_FILE_PATH_ROOT, exist_ok=True)
+    for detector, data_file in zip(detectors, DATA_FILES):
+        detector.write_events(config.OUTPUT_FILE_PATH_ROOT + 'events_' + data_file)
+
+
 def update_simulations(simulations, delta_time) -> None:
     for sim in simulations:
         sim.elapsed_time += delta_time
@@ -33,19 +56,17 @@ def update_simulations(simulations, delta_time) -> None:
 
 
 # TODO: Add the ability to save data to a file
-def collect_data(simulations, sun_position) -> tuple:
-    uranus_positions = [sim.get_planet_position('Uranus') for sim in simulations]
+def collect_data(simulations) -> tuple:
+    distances = [sim.get_distance_to_sun('Uranus') for sim in simulations]
 
-    if all(pos is not None for pos in uranus_positions):
-        distances = [np.linalg.norm(pos - sun_position) for pos in uranus_positions]
+    if all(distance is not None for distance in distances):
         return simulations[0].elapsed_time, distances[0], distances[1]
 
     return None, None, None
 
 
-def run_simulation(simulations, renderers):
+def run_simulation(simulations, renderers, detectors):
     clock = pygame.time.Clock()
-    sun_position = simulations[0].get_planet_position('Sun')
     time_data, distance_data1, distance_data2 = [], [], []
     total_elapsed_time = 0
 
@@ -55,10 +76,13 @@ def run_simulation(simulations, renderers):
 
         update_simulations(simulations, delta_time)
 
+        for detector in detectors:
+            detector.update()
+
         if config.SHOW_GRAPHICAL_VIEW:
             renderers[0].draw_all()
 
-        elapsed_time, distance1, distance2 = collect_data(simulations, sun_position)
+        elapsed_time, distance1, distance2 = collect_data(simulations)
 
         if elapsed_time is not None:
             time_data.append(elapsed_time)
@@ -75,8 +99,10 @@ def main() -> None:
     pygame.init()
 
     simulations, renderers = initialize_simulations()
+    detectors = initialize_event_detectors(simulations)
 
-    time_data, distance_data1, distance_data2 = run_simulation(simulations, renderers)
+    time_data, distance_data1, distance_data2 = run_simulation(simulations, renderers, detectors)
+    write_events(detectors)
 
     plot_data(time_data, distance_data1, distance_data2, ['Uranus with Neptune', 'Uranus without Neptune'])
 
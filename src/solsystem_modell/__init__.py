@@ -1 +1 @@
-__all__ = ['celestial_body', 'plotter', 'simulation', 'renderer', 'utils']
+__all__ = ['celestial_body', 'events', 'forces', 'plotter', 'simulation', 'renderer', 'utils']
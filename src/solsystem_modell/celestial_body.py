@@ -103,9 +103,8 @@ class CelestialBody:
     def velocity_norm(self) -> float:
         return np.linalg.norm(self.velocity)
 
-    def render_name(self, font, sun: 'CelestialBody') -> None:
-        distance = self.distance_to_sun(sun) / config.AU
-        velocity_norm = self.velocity_norm()
+    def render_name(self, font, distance_to_sun: float, velocity_norm: float) -> None:
+        distance = distance_to_sun / config.AU
 
         label_lines = [
             f'{self.name}',
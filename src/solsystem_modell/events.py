@@ -0,0 +1,213 @@
+import csv
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src import config
+
+
+@dataclass
+class Event:
+    """
+    Represents a single detected event.
+    """
+    time: float
+    kind: str
+    body1: str
+    body2: str
+    distance: float
+
+
+@dataclass
+class BodyState:
+    """
+    Represents the position and velocity of a celestial body at one point in time.
+    """
+    position: np.ndarray
+    velocity: np.ndarray
+
+
+def interpolate_state(state0: 'BodyState', state1: 'BodyState', step: float, fraction: float) -> 'BodyState':
+    """
+    Cubic Hermite interpolation of a body's state between the start and the end of a step.
+    """
+    s = fraction
+    position = ((2 * s ** 3 - 3 * s ** 2 + 1) * state0.position
+                + (s ** 3 - 2 * s ** 2 + s) * step * state0.velocity
+                + (-2 * s ** 3 + 3 * s ** 2) * state1.position
+                + (s ** 3 - s ** 2) * step * state1.velocity)
+    velocity = ((6 * s ** 2 - 6 * s) * state0.position / step
+                + (3 * s ** 2 - 4 * s + 1) * state0.velocity
+                + (-6 * s ** 2 + 6 * s) * state1.position / step
+                + (3 * s ** 2 - 2 * s) * state1.velocity)
+    return BodyState(position, velocity)
+
+
+class EventWatcher(ABC):
+    """
+    Watches a pair of celestial bodies for sign changes of a scalar function of their states.
+    """
+
+    def __init__(self, body1: 'CelestialBody', body2: 'CelestialBody') -> None:
+        self.body1 = body1
+        self.body2 = body2
+
+    @property
+    def bodies(self) -> list:
+        return [self.body1, self.body2]
+
+    @abstractmethod
+    def evaluate(self, states: dict) -> float:
+        pass
+
+    @abstractmethod
+    def classify(self, value_before: float, states: dict) -> str | None:
+        pass
+
+
+class ApproachWatcher(EventWatcher):
+    """
+    Finds the minima and maxima of the distance between two bodies, where their radial velocity changes sign.
+    Used both for close approaches and for periapsis and apoapsis passages around a central body.
+    """
+
+    def __init__(self, body1: 'CelestialBody', body2: 'CelestialBody', minimum_kind: str,
+                 maximum_kind: str | None = None, max_distance: float = np.inf) -> None:
+        super().__init__(body1, body2)
+        self.minimum_kind = minimum_kind
+        self.maximum_kind = maximum_kind
+        self.max_distance = max_distance
+
+    def evaluate(self, states: dict) -> float:
+        state1, state2 = states[self.body1], states[self.body2]
+        return np.dot(state2.position - state1.position, state2.velocity - state1.velocity)
+
+    def classify(self, value_before: float, states: dict) -> str | None:
+        if value_before > 0:
+            return self.maximum_kind
+        distance = np.linalg.norm(states[self.body2].position - states[self.body1].position)
+        return self.minimum_kind if distance <= self.max_distance else None
+
+
+class ConjunctionWatcher(EventWatcher):
+    """
+    Finds conjunctions and oppositions of two bodies as seen from a central body.
+    """
+
+    def __init__(self, body1: 'CelestialBody', body2: 'CelestialBody', center: 'CelestialBody') -> None:
+        super().__init__(body1, body2)
+        self.center = center
+
+    @property
+    def bodies(self) -> list:
+        return [self.body1, self.body2, self.center]
+
+    def relative_positions(self, states: dict) -> tuple:
+        center_position = states[self.center].position
+        return states[self.body1].position - center_position, states[self.body2].position - center_position
+
+    def evaluate(self, states: dict) -> float:
+        position1, position2 = self.relative_positions(states)
+        return position1[0] * position2[1] - position1[1] * position2[0]
+
+    def classify(self, value_before: float, states: dict) -> str | None:
+        position1, position2 = self.relative_positions(states)
+        return 'conjunction' if np.dot(position1, position2) > 0 else 'opposition'
+
+
+class EventDetector:
+    """
+    Detects close approaches, conjunctions and apsis passages incrementally while a simulation runs.
+    The event times are refined by root-finding on an interpolation of the states between two steps.
+    """
+
+    def __init__(self, simulation: 'Simulation') -> None:
+        self.simulation = simulation
+        self.watchers = []
+        self.events = []
+        self.previous_time = simulation.elapsed_time
+        self.previous_states = {}
+        self.previous_values = {}
+
+    def find_body(self, name: str) -> 'CelestialBody':
+        celestial_body = self.simulation.get_body(name)
+        if celestial_body is not None:
+            return celestial_body
+        raise ValueError(f'No celestial body named {name} in the simulation.')
+
+    def add_watcher(self, watcher: 'EventWatcher') -> None:
+        self.watchers.append(watcher)
+        for celestial_body in watcher.bodies:
+            self.previous_states[celestial_body] = self.current_state(celestial_body)
+        self.previous_values[watcher] = watcher.evaluate(self.previous_states)
+
+    def add_close_approach(self, name1: str, name2: str, max_distance: float = np.inf) -> None:
+        self.add_watcher(ApproachWatcher(self.find_body(name1), self.find_body(name2),
+                                         'close_approach', max_distance=max_distance))
+
+    def add_apsides(self, name: str, center: str = 'Sun') -> None:
+        self.add_watcher(ApproachWatcher(self.find_body(center), self.find_body(name), 'periapsis', 'apoapsis'))
+
+    def add_conjunction(self, name1: str, name2: str, center: str = 'Sun') -> None:
+        self.add_watcher(ConjunctionWatcher(self.find_body(name1), self.find_body(name2), self.find_body(center)))
+
+    @staticmethod
+    def current_state(celestial_body: 'CelestialBody') -> 'BodyState':
+        return BodyState(celestial_body.position.copy(), celestial_body.velocity.copy())
+
+    def update(self) -> None:
+        time = self.simulation.elapsed_time
+        step = time - self.previous_time
+        states = {celestial_body: self.current_state(celestial_body) for celestial_body in self.previous_states}
+
+        for watcher in self.watchers:
+            value_after = watcher.evaluate(states)
+            if step > 0:
+                self.check_watcher(watcher, self.previous_values[watcher], value_after, states, step)
+            self.previous_values[watcher] = value_after
+
+        self.previous_time = time
+        self.previous_states = states
+
+    def check_watcher(self, watcher: 'EventWatcher', value_before: float, value_after: float,
+                      states: dict, step: float) -> None:
+        # A root exactly on a step boundary belongs to the step that ends on it, not the one that starts on it
+        if not (value_before < 0 <= value_after or value_before > 0 >= value_after):
+            return
+
+        def interpolate(fraction: float) -> dict:
+            return {celestial_body: interpolate_state(self.previous_states[celestial_body],
+                                                      states[celestial_body], step, fraction)
+                    for celestial_body in watcher.bodies}
+
+        fraction = self.find_root(lambda s: watcher.evaluate(interpolate(s)), value_before, step)
+        interpolated = interpolate(fraction)
+        kind = watcher.classify(value_before, interpolated)
+        if kind is not None:
+            distance = np.linalg.norm(interpolated[watcher.body2].position - interpolated[watcher.body1].position)
+            self.events.append(Event(self.previous_time + fraction * step, kind,
+                                     watcher.body1.name, watcher.body2.name, distance))
+
+    @staticmethod
+    def find_root(function, value_low: float, step: float) -> float:
+        low, high = 0.0, 1.0
+        while (high - low) * step > config.EVENT_TIME_TOLERANCE:
+            middle = (low + high) / 2
+            value_middle = function(middle)
+            if np.sign(value_middle) == np.sign(value_low):
+                low, value_low = middle, value_middle
+            else:
+                high = middle
+        return (low + high) / 2
+
+    def write_events(self, file_name) -> None:
+        start_date = datetime.strptime(config.START_DATE, '%Y-%m-%d')
+        with open(file_name, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['Time (s)', 'Date', 'Event', 'Body 1', 'Body 2', 'Distance (AU)'])
+            for event in sorted(self.events, key=lambda e: e.time):
+                date = start_date + timedelta(seconds=event.time)
+                writer.writerow([f'{event.time:.1f}', date.strftime('%Y-%m-%d %H:%M'), event.kind,
+                                 event.body1, event.body2, f'{event.distance / config.AU:.6f}'])
@@ -0,0 +1,102 @@
+from concurrent.futures import Executor
+
+import numpy as np
+
+from src import config
+
+
+def calculate_tile_forces(positions: np.ndarray, masses: np.ndarray, rows: np.ndarray,
+                          column_tile_size: int = None) -> np.ndarray:
+    """
+    Calculates the gravitational forces acting on the bodies in rows from every body in positions.
+    The columns are processed in tiles so the intermediate arrays stay small, and the numpy kernels
+    release the GIL so several tiles can run on a thread pool at once.
+    """
+    if column_tile_size is None:
+        column_tile_size = config.FORCE_TILE_SIZE
+
+    forces = np.zeros((len(rows), 2), dtype=np.float64)
+    row_positions = positions[rows]
+    row_masses = masses[rows]
+
+    for start in range(0, len(positions), column_tile_size):
+        stop = min(start + column_tile_size, len(positions))
+        distance_vectors = positions[np.newaxis, start:stop, :] - row_positions[:, np.newaxis, :]
+        distances = np.hypot(distance_vectors[..., 0], distance_vectors[..., 1])
+
+        is_self = rows[:, np.newaxis] == np.arange(start, stop)[np.newaxis, :]
+        if np.any((distances == 0) & ~is_self):
+            raise ZeroDivisionError('Distance between celestial bodies cannot be zero.')
+        distances[is_self] = np.inf
+
+        force_magnitudes = config.GAMMA * row_masses[:, np.newaxis] * masses[np.newaxis, start:stop] / distances ** 2
+        forces += np.einsum('ij,ijk->ik', force_magnitudes / distances, distance_vectors)
+
+    return forces
+
+
+def calculate_tile_jerks(positions: np.ndarray, velocities: np.ndarray, masses: np.ndarray, rows: np.ndarray,
+                          column_tile_size: int = None) -> np.ndarray:
+    """
+    Calculates the time derivative of the gravitational acceleration of the bodies in rows. It only depends
+    on relative positions and velocities, so it is the same in every inertial frame.
+    """
+    if column_tile_size is None:
+        column_tile_size = config.FORCE_TILE_SIZE
+
+    jerks = np.zeros((len(rows), 2), dtype=np.float64)
+    row_positions = positions[rows]
+    row_velocities = velocities[rows]
+
+    for start in range(0, len(positions), column_tile_size):
+        stop = min(start + column_tile_size, len(positions))
+        distance_vectors = positions[np.newaxis, start:stop, :] - row_positions[:, np.newaxis, :]
+        velocity_differences = velocities[np.newaxis, start:stop, :] - row_velocities[:, np.newaxis, :]
+        distances = np.hypot(distance_vectors[..., 0], distance_vectors[..., 1])
+        distances[rows[:, np.newaxis] == np.arange(start, stop)[np.newaxis, :]] = np.inf
+
+        factors = config.GAMMA * masses[np.newaxis, start:stop] / distances ** 3
+        radial_rates = np.einsum('ijk,ijk->ij', distance_vectors, velocity_differences) / distances ** 2
+        jerks += (np.einsum('ij,ijk->ik', factors, velocity_differences)
+                  - np.einsum('ij,ijk->ik', 3 * factors * radial_rates, distance_vectors))
+
+    return jerks
+
+
+def calculate_row_tile_size(row_count: int, workers: int = None) -> int:
+    """
+    Chooses a row tile size that gives every worker FORCE_TILES_PER_WORKER tiles,
+    kept between MIN_FORCE_TILE_SIZE and FORCE_TILE_SIZE.
+    """
+    if workers is None:
+        workers = config.FORCE_WORKERS
+
+    tile_size = -(-row_count // (workers * config.FORCE_TILES_PER_WORKER))
+    return min(max(tile_size, config.MIN_FORCE_TILE_SIZE), config.FORCE_TILE_SIZE)
+
+
+def calculate_in_row_tiles(kernel, arrays: tuple, executor: Executor, rows: np.ndarray = None,
+                           row_tile_size: int = None) -> np.ndarray:
+    """
+    Splits the evaluation of a tile kernel for the bodies in rows (all bodies by default) into row tiles
+    and evaluates them concurrently on the executor.
+    """
+    if rows is None:
+        rows = np.arange(len(arrays[0]))
+    if row_tile_size is None:
+        row_tile_size = calculate_row_tile_size(len(rows))
+
+    tiles = [rows[start:start + row_tile_size] for start in range(0, len(rows), row_tile_size)]
+    futures = [executor.submit(kernel, *arrays, tile) for tile in tiles]
+    return np.concatenate([future.result() for future in futures]) if futures else np.zeros((0, 2))
+
+
+def calculate_forces_parallel(positions: np.ndarray, masses: np.ndarray, executor: Executor,
+                              rows: np.ndarray = None, row_tile_size: int = None) -> np.ndarray:
+    return calculate_in_row_tiles(calculate_tile_forces, (positions, masses), executor, rows, row_tile_size)
+
+
+def calculate_jerks_parallel(positions: np.ndarray, velocities: np.ndarray, masses: np.ndarray,
+                             executor: Executor, rows: np.ndarray = None, row_tile_size: int = None) -> np.ndarray:
+    return calculate_in_row_tiles(calculate_tile_jerks, (positions, velocities, masses), executor, rows,
+                                  row_tile_size)
@@ -18,16 +18,19 @@ class Renderer:
         self.print_time_elapsed()
         self.draw_planets()
 
-        sun = next((celestial_body for celestial_body in self.simulation.celestial_bodies
-                    if celestial_body.name == 'Sun'), None)
-
-        for celestial_body in self.simulation.celestial_bodies:
-            self.draw_labels(celestial_body, sun)
+        if self.simulation.get_body('Sun') is not None:
+            self.draw_label_for_every_body()
 
         self.draw_debug_info()
 
         pygame.display.flip()
 
+    def draw_label_for_every_body(self) -> None:
+        derived_quantities = self.simulation.get_derived_quantities()
+        for i, celestial_body in enumerate(self.simulation.celestial_bodies):
+            self.draw_labels(celestial_body, derived_quantities.heliocentric_positions[i],
+                             derived_quantities.distances_to_sun[i], derived_quantities.speeds[i])
+
     def draw_debug_info(self):
         if config.DEBUG_MODE:
             real_time = self.simulation.elapsed_time / config.TIME_ACCELERATION
@@ -78,34 +81,35 @@ class Renderer:
         current_date_text, days_text, years_text = self.render_elapsed_time(days_elapsed, years_elapsed)
         self.blit_elapsed_time(current_date_text, days_text, years_text)
 
-    def calculate_position(self, celestial_body: 'CelestialBody', sun: 'CelestialBody') -> tuple:
-        x = int(self.simulation.width / 2 + ((celestial_body.position[0] - sun.position[0]) /
+    def calculate_position(self, heliocentric_position: 'np.ndarray') -> tuple:
+        x = int(self.simulation.width / 2 + (heliocentric_position[0] /
                                              self.simulation.real_width) * self.simulation.width)
-        y = int(self.simulation.height / 2 + ((celestial_body.position[1] - sun.position[1]) /
+        y = int(self.simulation.height / 2 + (heliocentric_position[1] /
                                               self.simulation.real_height) * self.simulation.height)
         return x, y
 
     def draw_planets(self) -> None:
-        sun = next((celestial_body for celestial_body in self.simulation.celestial_bodies
-                    if celestial_body.name == 'Sun'), None)
+        sun = self.simulation.get_body('Sun')
         if sun is None:
             return
 
-        for celestial_body in self.simulation.celestial_bodies:
+        derived_quantities = self.simulation.get_derived_quantities()
+        for i, celestial_body in enumerate(self.simulation.celestial_bodies):
             if len(celestial_body.positions) > 1:
                 self.draw_trail(celestial_body, sun)
 
-            x, y = self.calculate_position(celestial_body, sun)
+            x, y = self.calculate_position(derived_quantities.heliocentric_positions[i])
             pygame.draw.circle(self.simulation.screen, celestial_body.color,
                                (x, y), celestial_body.size)
 
-    def draw_labels(self, celestial_body: 'CelestialBody', sun: 'CelestialBody') -> None:
+    def draw_labels(self, celestial_body: 'CelestialBody', heliocentric_position: 'np.ndarray',
+                    distance_to_sun: float, velocity_norm: float) -> None:
         if not config.DEBUG_MODE:
             return
 
-        celestial_body.render_name(self.simulation.font, sun)
+        celestial_body.render_name(self.simulation.font, distance_to_sun, velocity_norm)
 
-        x, y = self.calculate_position(celestial_body, sun)
+        x, y = self.calculate_position(heliocentric_position)
 
         line_height = self.simulation.font.get_linesize()
         for label_surface in celestial_body.label_surfaces:
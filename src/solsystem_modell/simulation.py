@@ -1,10 +1,28 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
 import numpy as np
 import pygame
 
 from src import config
+from src.solsystem_modell.forces import (calculate_forces_parallel, calculate_jerks_parallel, calculate_tile_forces,
+                                         calculate_tile_jerks)
 from src.solsystem_modell.utils import create_celestial_bodies
 
 
+@dataclass
+class DerivedQuantities:
+    """
+    Quantities derived from the state of the celestial bodies, indexed like Simulation.celestial_bodies.
+    """
+    positions: np.ndarray
+    velocities: np.ndarray
+    heliocentric_positions: np.ndarray
+    barycentric_positions: np.ndarray
+    distances_to_sun: np.ndarray
+    speeds: np.ndarray
+
+
 class Simulation:
     """
     The Simulation class represents a simulation of celestial bodies in a solar system.
@@ -19,6 +37,23 @@ class Simulation:
         self.real_height = None
         self.font = None
         self.elapsed_time = 0
+        self.executor = None
+
+    @property
+    def celestial_bodies(self) -> tuple:
+        return self._celestial_bodies
+
+    @celestial_bodies.setter
+    def celestial_bodies(self, celestial_bodies) -> None:
+        """
+        The celestial bodies are stored as a tuple, so they can only be changed by assigning a new sequence,
+        which keeps the name index and the derived quantities in step with them.
+        """
+        self._celestial_bodies = tuple(celestial_bodies)
+        self.body_indices = {}
+        for i, celestial_body in enumerate(self._celestial_bodies):
+            self.body_indices.setdefault(celestial_body.name, i)
+        self.derived_quantities = None
 
     def initialize_simulation(self, file_name) -> None:
         scale = config.AU / 10
@@ -35,20 +70,70 @@ class Simulation:
         self.font = pygame.font.SysFont(None, config.FONT_SIZE)
 
     def calculate_forces(self) -> dict:
-        forces = {celestial_body: np.zeros(2, dtype=np.float64) for celestial_body in self.celestial_bodies}
-        for i, celestial_body_i in enumerate(self.celestial_bodies):
-            for celestial_body_j in self.celestial_bodies[i + 1:]:
-                force = celestial_body_i.calculate_gravitational_force(celestial_body_j)
-                forces[celestial_body_i] += force
-                forces[celestial_body_j] -= force
-        return forces
+        return self.calculate_forces_on(range(len(self.celestial_bodies)))
+
+    def calculate_forces_on(self, indices) -> dict:
+        indices = np.fromiter(indices, dtype=np.intp)
+        positions = np.array([celestial_body.position for celestial_body in self.celestial_bodies])
+        masses = np.array([celestial_body.mass for celestial_body in self.celestial_bodies], dtype=np.float64)
+
+        if self.uses_thread_pool():
+            forces = calculate_forces_parallel(positions, masses, self.get_executor(), indices)
+        else:
+            forces = calculate_tile_forces(positions, masses, indices)
+        return dict(zip((self.celestial_bodies[i] for i in indices), forces))
+
+    def calculate_jerks(self) -> np.ndarray:
+        positions = np.array([celestial_body.position for celestial_body in self.celestial_bodies])
+        velocities = np.array([celestial_body.velocity for celestial_body in self.celestial_bodies])
+        masses = np.array([celestial_body.mass for celestial_body in self.celestial_bodies], dtype=np.float64)
+        rows = np.arange(len(self.celestial_bodies))
+
+        if self.uses_thread_pool():
+            return calculate_jerks_parallel(positions, velocities, masses, self.get_executor(), rows)
+        return calculate_tile_jerks(positions, velocities, masses, rows)
+
+    def uses_thread_pool(self) -> bool:
+        return len(self.celestial_bodies) >= config.PARALLEL_FORCE_THRESHOLD
+
+    def get_executor(self) -> ThreadPoolExecutor:
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=config.FORCE_WORKERS)
+        return self.executor
+
+    def calculate_timestep_levels(self, forces: dict, delta_time: float) -> list:
+        """
+        Chooses the level of every celestial body from its acceleration divided by the rate of change of its
+        acceleration. Both only depend on relative positions and velocities, so a moon is stepped on the time
+        scale of its orbit around its planet, whatever its speed around the Sun.
+        """
+        jerks = self.calculate_jerks()
+        levels = []
+        for celestial_body, jerk in zip(self.celestial_bodies, jerks):
+            if celestial_body.is_stationary or celestial_body.mass == 0:
+                levels.append(0)
+                continue
+
+            acceleration = np.linalg.norm(forces[celestial_body]) / celestial_body.mass
+            jerk_norm = np.linalg.norm(jerk)
+            if jerk_norm == 0:
+                levels.append(0)
+            elif acceleration == 0:
+                levels.append(config.MAX_TIMESTEP_LEVEL)
+            else:
+                dynamical_time = acceleration / jerk_norm
+                level = np.ceil(np.log2(delta_time / (config.TIMESTEP_ACCURACY * dynamical_time)))
+                levels.append(int(min(max(level, 0), config.MAX_TIMESTEP_LEVEL)))
+        return levels
 
     def update_planet_velocity(self, forces: dict, delta_time: float) -> None:
+        self.derived_quantities = None
         for celestial_body in self.celestial_bodies:
             if not celestial_body.is_stationary:
                 celestial_body.velocity += forces[celestial_body] / celestial_body.mass * delta_time
 
     def update_planet_position(self, delta_time: float) -> None:
+        self.derived_quantities = None
         for celestial_body in self.celestial_bodies:
             if not celestial_body.is_stationary:
                 celestial_body.update_position(delta_time)
@@ -61,13 +146,83 @@ class Simulation:
                 celestial_body.time_since_last_trail_update = 0
 
     def update_planet_positions(self, delta_time: float) -> None:
+        self.derived_quantities = None
+
+        if config.USE_BLOCK_TIMESTEPS:
+            self.update_planet_positions_in_blocks(delta_time)
+            return
+
         forces = self.calculate_forces()
         self.update_planet_velocity(forces, delta_time)
         self.update_planet_position(delta_time)
         self.update_trail(delta_time)
 
+    def update_planet_positions_in_blocks(self, delta_time: float) -> None:
+        """
+        Steps every celestial body with its own power-of-two fraction of delta_time, chosen from the ratio
+        between its speed and acceleration. Forces are only evaluated for the bodies due a kick, while every
+        body drifts on the finest step, so all bodies are synchronized again at the end of delta_time.
+        """
+        forces = self.calculate_forces()
+        levels = self.calculate_timestep_levels(forces, delta_time)
+        max_level = max(levels, default=0)
+        fine_step = delta_time / 2 ** max_level
+
+        for substep in range(2 ** max_level):
+            active = [i for i, level in enumerate(levels) if substep % 2 ** (max_level - level) == 0]
+            if substep > 0:
+                forces = self.calculate_forces_on(active)
+
+            for i in active:
+                celestial_body = self.celestial_bodies[i]
+                if not celestial_body.is_stationary:
+                    celestial_body.velocity += forces[celestial_body] / celestial_body.mass * (
+                            delta_time / 2 ** levels[i])
+
+            self.update_planet_position(fine_step)
+
+        self.update_trail(delta_time)
+
+    def get_body_index(self, name: str) -> int | None:
+        return self.body_indices.get(name)
+
+    def get_body(self, name: str) -> 'CelestialBody | None':
+        index = self.get_body_index(name)
+        return None if index is None else self.celestial_bodies[index]
+
     def get_planet_position(self, planet_name):
-        for celestial_body in self.celestial_bodies:
-            if celestial_body.name == planet_name:
-                return celestial_body.position
-        return None
+        celestial_body = self.get_body(planet_name)
+        return None if celestial_body is None else celestial_body.position
+
+    def get_distance_to_sun(self, name: str) -> float | None:
+        index = self.get_body_index(name)
+        return None if index is None else self.get_derived_quantities().distances_to_sun[index]
+
+    def get_derived_quantities(self) -> 'DerivedQuantities':
+        """
+        Returns the derived quantities for the current step. They are computed once per step and shared
+        by the renderer and the data collectors. They are invalidated by the update methods of the simulation
+        and by assigning celestial_bodies; after changing a body's position or velocity directly, set
+        derived_quantities to None.
+        """
+        if self.derived_quantities is None:
+            positions = np.array([celestial_body.position for celestial_body in self.celestial_bodies],
+                                 dtype=np.float64).reshape(-1, 2)
+            velocities = np.array([celestial_body.velocity for celestial_body in self.celestial_bodies],
+                                  dtype=np.float64).reshape(-1, 2)
+            masses = np.array([celestial_body.mass for celestial_body in self.celestial_bodies], dtype=np.float64)
+
+            sun_index = self.get_body_index('Sun')
+            sun_position = positions[sun_index] if sun_index is not None else np.zeros(2)
+            heliocentric_positions = positions - sun_position
+            total_mass = masses.sum()
+            center_of_mass = masses @ positions / total_mass if total_mass > 0 else np.zeros(2)
+
+            self.derived_quantities = DerivedQuantities(
+                positions=positions,
+                velocities=velocities,
+                heliocentric_positions=heliocentric_positions,
+                barycentric_positions=positions - center_of_mass,
+                distances_to_sun=np.hypot(heliocentric_positions[:, 0], heliocentric_positions[:, 1]),
+                speeds=np.hypot(velocities[:, 0], velocities[:, 1]))
+        return self.derived_quantities
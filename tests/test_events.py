@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import src.solsystem_modell.events as events
+from src.solsystem_modell.simulation import Simulation
+
+
+class Body:
+    def __init__(self, name, position, velocity):
+        self.name = name
+        self.position = np.array(position, dtype=np.float64)
+        self.velocity = np.array(velocity, dtype=np.float64)
+
+
+class TestEventDetector(unittest.TestCase):
+    def setUp(self):
+        self.sun = Body('Sun', (0, 0), (0, 0))
+        self.comet = Body('Comet', (-1e9, 1e8), (1e3, 0))
+        self.simulation = Simulation()
+        self.simulation.celestial_bodies = [self.sun, self.comet]
+        self.detector = events.EventDetector(self.simulation)
+
+    def step(self, delta_time, steps):
+        for _ in range(steps):
+            self.simulation.elapsed_time += delta_time
+            self.comet.position += self.comet.velocity * delta_time
+            self.detector.update()
+
+    def test_close_approach_time_is_refined_between_steps(self):
+        self.detector.add_close_approach('Sun', 'Comet')
+        self.step(333000, 10)
+        self.assertEqual(len(self.detector.events), 1)
+        event = self.detector.events[0]
+        self.assertEqual(event.kind, 'close_approach')
+        self.assertAlmostEqual(event.time, 1e6, delta=60)
+        self.assertAlmostEqual(event.distance, 1e8, delta=1e3)
+
+    def test_close_approach_on_step_boundary_is_recorded_once(self):
+        self.detector.add_close_approach('Sun', 'Comet')
+        self.step(1e5, 20)
+        self.assertEqual([event.kind for event in self.detector.events], ['close_approach'])
+        self.assertAlmostEqual(self.detector.events[0].time, 1e6, delta=60)
+
+    def test_steps_without_a_crossing_are_not_interpolated(self):
+        self.detector.add_close_approach('Sun', 'Comet')
+        with mock.patch.object(events, 'interpolate_state', wraps=events.interpolate_state) as interpolate_state:
+            self.step(1e5, 5)
+        self.assertEqual(interpolate_state.call_count, 0)
+
+    def test_close_approach_outside_max_distance_is_ignored(self):
+        self.detector.add_close_approach('Sun', 'Comet', max_distance=1e7)
+        self.step(333000, 10)
+        self.assertEqual(self.detector.events, [])
+
+    def test_add_close_approach_with_unknown_body(self):
+        with self.assertRaises(ValueError):
+            self.detector.add_close_approach('Sun', 'Nemesis')
+
+    def test_conjunction(self):
+        self.simulation.celestial_bodies = [self.sun, self.comet, Body('Planet', (0, 1e9), (0, 0))]
+        self.detector.add_conjunction('Comet', 'Planet')
+        self.step(333000, 10)
+        self.assertEqual([event.kind for event in self.detector.events], ['conjunction'])
+        self.assertAlmostEqual(self.detector.events[0].time, 1e6, delta=60)
+
+    def test_conjunction_on_step_boundary_is_recorded_once(self):
+        self.simulation.celestial_bodies = [self.sun, self.comet, Body('Planet', (0, 1e9), (0, 0))]
+        self.detector.add_conjunction('Comet', 'Planet')
+        self.step(1e5, 20)
+        self.assertEqual([event.kind for event in self.detector.events], ['conjunction'])
+        self.assertAlmostEqual(self.detector.events[0].time, 1e6, delta=60)
+
+    def test_incomplete_watcher_cannot_be_created(self):
+        class DistanceWatcher(events.EventWatcher):
+            def evaluate(self, states):
+                return 0
+
+        with self.assertRaises(TypeError):
+            DistanceWatcher(self.sun, self.comet)
+
+    def test_write_events(self):
+        self.detector.add_close_approach('Sun', 'Comet')
+        self.step(333000, 10)
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'events.csv')
+            self.detector.write_events(file_name)
+            with open(file_name) as file:
+                lines = file.read().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn('close_approach', lines[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
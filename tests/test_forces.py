@@ -0,0 +1,67 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import src.config as config
+import src.solsystem_modell.forces as forces
+
+
+class TestForces(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.positions = rng.uniform(-30 * config.AU, 30 * config.AU, (50, 2))
+        self.masses = rng.uniform(1e20, 1e27, 50)
+
+    def calculate_pairwise_forces(self):
+        expected = np.zeros_like(self.positions)
+        for i in range(len(self.positions)):
+            for j in range(i + 1, len(self.positions)):
+                distance_vector = self.positions[j] - self.positions[i]
+                distance = np.linalg.norm(distance_vector)
+                force = config.GAMMA * self.masses[i] * self.masses[j] / distance ** 2 * distance_vector / distance
+                expected[i] += force
+                expected[j] -= force
+        return expected
+
+    def test_calculate_tile_forces_matches_pairwise(self):
+        rows = np.arange(len(self.positions))
+        calculated = forces.calculate_tile_forces(self.positions, self.masses, rows, column_tile_size=7)
+        np.testing.assert_allclose(calculated, self.calculate_pairwise_forces(), rtol=1e-9)
+
+    def test_calculate_forces_parallel_matches_pairwise(self):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            calculated = forces.calculate_forces_parallel(self.positions, self.masses, executor, row_tile_size=8)
+        np.testing.assert_allclose(calculated, self.calculate_pairwise_forces(), rtol=1e-9)
+
+    def test_calculate_tile_jerks_matches_finite_difference(self):
+        rng = np.random.default_rng(1)
+        velocities = rng.uniform(-3e4, 3e4, self.positions.shape)
+        rows = np.arange(len(self.positions))
+        delta_time = 10.0
+
+        def calculate_accelerations(time):
+            positions = self.positions + velocities * time
+            return forces.calculate_tile_forces(positions, self.masses, rows) / self.masses[:, np.newaxis]
+
+        expected = (calculate_accelerations(delta_time) - calculate_accelerations(-delta_time)) / (2 * delta_time)
+        calculated = forces.calculate_tile_jerks(self.positions, velocities, self.masses, rows, column_tile_size=7)
+        np.testing.assert_allclose(calculated, expected, rtol=1e-5, atol=1e-6 * np.abs(expected).max())
+
+    def test_calculate_row_tile_size_gives_every_worker_tiles(self):
+        for workers in (1, 8, 64):
+            row_count = config.PARALLEL_FORCE_THRESHOLD * workers // config.FORCE_WORKERS
+            tile_size = forces.calculate_row_tile_size(row_count, workers)
+            self.assertGreaterEqual(-(-row_count // tile_size), workers * config.FORCE_TILES_PER_WORKER)
+
+        self.assertEqual(forces.calculate_row_tile_size(1, 64), config.MIN_FORCE_TILE_SIZE)
+        self.assertEqual(forces.calculate_row_tile_size(10 ** 7, 64), config.FORCE_TILE_SIZE)
+
+    def test_calculate_tile_forces_when_distance_is_zero(self):
+        self.positions[1] = self.positions[0]
+        with self.assertRaises(ZeroDivisionError):
+            forces.calculate_tile_forces(self.positions, self.masses, np.arange(len(self.positions)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,148 @@
-from unittest import TestCase
+from unittest import TestCase, mock
+
+import numpy as np
+
+import src.config as config
+from src.solsystem_modell.simulation import Simulation
+from src.solsystem_modell.utils import create_celestial_bodies, get_path
+from src.solsystem_modell.celestial_body import CelestialBody, CelestialBodyAppearance, CelestialBodyProperties
+
+
+def create_random_bodies(count: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    return [CelestialBody(CelestialBodyAppearance(f'Body {i}', (255, 255, 255), 1),
+                          CelestialBodyProperties(rng.uniform(1e20, 1e27), rng.uniform(0.1, 30) * config.AU,
+                                                  rng.uniform(1e3, 5e4), rng.uniform(0, 2 * np.pi), 100))
+            for i in range(count)]
 
 
 class TestSimulation(TestCase):
+    def setUp(self):
+        self.simulation = Simulation()
+        self.simulation.celestial_bodies = create_random_bodies(40)
+
+    def calculate_pairwise_forces(self) -> dict:
+        forces = {celestial_body: np.zeros(2) for celestial_body in self.simulation.celestial_bodies}
+        for i, celestial_body_i in enumerate(self.simulation.celestial_bodies):
+            for celestial_body_j in self.simulation.celestial_bodies[i + 1:]:
+                force = celestial_body_i.calculate_gravitational_force(celestial_body_j)
+                forces[celestial_body_i] += force
+                forces[celestial_body_j] -= force
+        return forces
+
     def test_initialize_simulation(self):
         self.fail()
 
     def test_calculate_forces(self):
-        self.fail()
+        with mock.patch.object(config, 'PARALLEL_FORCE_THRESHOLD', 1000):
+            serial_forces = self.simulation.calculate_forces()
+        self.assertIsNone(self.simulation.executor)
+
+        with mock.patch.object(config, 'PARALLEL_FORCE_THRESHOLD', 40):
+            parallel_forces = self.simulation.calculate_forces()
+        self.assertIsNotNone(self.simulation.executor)
+
+        pairwise_forces = self.calculate_pairwise_forces()
+        self.assertEqual(list(parallel_forces), list(self.simulation.celestial_bodies))
+        for celestial_body in self.simulation.celestial_bodies:
+            np.testing.assert_array_equal(parallel_forces[celestial_body], serial_forces[celestial_body])
+            np.testing.assert_allclose(parallel_forces[celestial_body], pairwise_forces[celestial_body],
+                                       rtol=1e-9, atol=1e-12 * np.abs(pairwise_forces[celestial_body]).max())
+
+    def test_calculate_timestep_levels(self):
+        self.simulation.celestial_bodies = create_celestial_bodies(get_path('solsystem_data.csv'))
+        forces = self.simulation.calculate_forces()
+        levels = dict(zip((celestial_body.name for celestial_body in self.simulation.celestial_bodies),
+                          self.simulation.calculate_timestep_levels(forces, 1e6)))
+        self.assertEqual(levels['Mercury'], config.MAX_TIMESTEP_LEVEL)
+        self.assertEqual(levels['Neptune'], 0)
+        self.assertGreater(levels['Earth'], levels['Jupiter'])
+
+    def test_calculate_timestep_levels_of_sun_planet_and_moon(self):
+        self.simulation.celestial_bodies = [
+            CelestialBody(CelestialBodyAppearance('Sun', (255, 255, 0), 1),
+                          CelestialBodyProperties(1.989e30, 0, 0, 0, 100)),
+            CelestialBody(CelestialBodyAppearance('Earth', (0, 0, 255), 1),
+                          CelestialBodyProperties(5.972e24, config.AU, 29780, np.pi / 2, 100)),
+            CelestialBody(CelestialBodyAppearance('Moon', (200, 200, 200), 1),
+                          CelestialBodyProperties(7.342e22, config.AU + 3.844e8, 29780 + 1022, np.pi / 2, 100))]
+        sun_level, earth_level, moon_level = self.simulation.calculate_timestep_levels(
+            self.simulation.calculate_forces(), 1e5)
+
+        self.assertGreaterEqual(moon_level, earth_level + 3)
+        self.assertLess(sun_level, config.MAX_TIMESTEP_LEVEL)
+
+        for celestial_body in self.simulation.celestial_bodies:
+            celestial_body.velocity += np.array([3e4, -1e4])
+        self.assertEqual(self.simulation.calculate_timestep_levels(self.simulation.calculate_forces(), 1e5),
+                         [sun_level, earth_level, moon_level])
+
+    def test_calculate_forces_on(self):
+        indices = [3, 17, 18, 39, 0]
+        for threshold in (1000, 1):
+            with mock.patch.object(config, 'PARALLEL_FORCE_THRESHOLD', threshold), \
+                    mock.patch.object(config, 'MIN_FORCE_TILE_SIZE', 2):
+                all_forces = self.simulation.calculate_forces()
+                subset_forces = self.simulation.calculate_forces_on(indices)
+
+            self.assertEqual(list(subset_forces), [self.simulation.celestial_bodies[i] for i in indices])
+            for celestial_body, force in subset_forces.items():
+                np.testing.assert_allclose(force, all_forces[celestial_body], rtol=1e-12)
+        self.assertIsNotNone(self.simulation.executor)
+
+    def test_update_planet_positions_in_blocks_matches_uniform_step_at_level_zero(self):
+        block_simulation = Simulation()
+        block_simulation.celestial_bodies = create_random_bodies(40)
+
+        with mock.patch.object(config, 'TIMESTEP_ACCURACY', 1e12):
+            self.assertEqual(set(block_simulation.calculate_timestep_levels(block_simulation.calculate_forces(), 1e6)),
+                             {0})
+            for _ in range(5):
+                self.simulation.update_planet_positions(1e6)
+                block_simulation.update_planet_positions_in_blocks(1e6)
+
+        for celestial_body, block_body in zip(self.simulation.celestial_bodies, block_simulation.celestial_bodies):
+            np.testing.assert_array_equal(block_body.position, celestial_body.position)
+            np.testing.assert_array_equal(block_body.velocity, celestial_body.velocity)
+
+    def update_planet_positions_in_blocks_with_constant_acceleration(self, acceleration: np.ndarray,
+                                                                     levels: list) -> dict:
+        kicks = {celestial_body: 0 for celestial_body in self.simulation.celestial_bodies}
+
+        def calculate_constant_forces(indices):
+            forces = {}
+            for i in indices:
+                celestial_body = self.simulation.celestial_bodies[i]
+                kicks[celestial_body] += 1
+                forces[celestial_body] = acceleration * celestial_body.mass
+            return forces
+
+        with mock.patch.object(self.simulation, 'calculate_forces_on', side_effect=calculate_constant_forces), \
+                mock.patch.object(self.simulation, 'calculate_timestep_levels', return_value=levels):
+            self.simulation.update_planet_positions_in_blocks(1e6)
+        return kicks
+
+    def test_update_planet_positions_in_blocks_synchronizes_velocities(self):
+        levels = [i % 4 for i in range(len(self.simulation.celestial_bodies))]
+        acceleration = np.array([1e-3, -2e-3])
+        initial_velocities = [celestial_body.velocity.copy() for celestial_body in self.simulation.celestial_bodies]
+
+        kicks = self.update_planet_positions_in_blocks_with_constant_acceleration(acceleration, levels)
+
+        for celestial_body, level, initial_velocity in zip(self.simulation.celestial_bodies, levels,
+                                                           initial_velocities):
+            self.assertEqual(kicks[celestial_body], 2 ** level)
+            np.testing.assert_allclose(celestial_body.velocity, initial_velocity + acceleration * 1e6, rtol=1e-12)
+
+    def test_update_planet_positions_in_blocks_synchronizes_positions(self):
+        levels = [i % 4 for i in range(len(self.simulation.celestial_bodies))]
+        expected_positions = [celestial_body.position + celestial_body.velocity * 1e6
+                              for celestial_body in self.simulation.celestial_bodies]
+
+        self.update_planet_positions_in_blocks_with_constant_acceleration(np.zeros(2), levels)
+
+        for celestial_body, expected_position in zip(self.simulation.celestial_bodies, expected_positions):
+            np.testing.assert_allclose(celestial_body.position, expected_position, rtol=1e-12)
 
     def test_update_planet_velocity(self):
         self.fail()
@@ -21,4 +157,77 @@ class TestSimulation(TestCase):
         self.fail()
 
     def test_get_planet_position(self):
-        self.fail()
+        self.simulation.celestial_bodies = create_celestial_bodies(get_path('solsystem_data.csv'))
+        uranus = next(celestial_body for celestial_body in self.simulation.celestial_bodies
+                      if celestial_body.name == 'Uranus')
+        self.assertIs(self.simulation.get_planet_position('Uranus'), uranus.position)
+        self.assertIsNone(self.simulation.get_planet_position('Nemesis'))
+
+    def test_get_body_after_celestial_bodies_are_reordered(self):
+        celestial_bodies = list(self.simulation.celestial_bodies)
+        self.simulation.celestial_bodies = celestial_bodies[::-1]
+        self.assertIs(self.simulation.get_body('Body 0'), celestial_bodies[0])
+        self.assertEqual(self.simulation.get_body_index('Body 0'), len(celestial_bodies) - 1)
+
+    def test_get_body_with_duplicate_names(self):
+        duplicates = create_random_bodies(2, seed=1)
+        duplicates[1].name = duplicates[0].name
+        self.simulation.celestial_bodies = duplicates
+        self.assertIs(self.simulation.get_body(duplicates[0].name), duplicates[0])
+
+    def test_celestial_bodies_cannot_be_changed_in_place(self):
+        with self.assertRaises(AttributeError):
+            self.simulation.celestial_bodies.append(create_random_bodies(1)[0])
+
+    def test_get_derived_quantities(self):
+        self.simulation.celestial_bodies = create_celestial_bodies(get_path('solsystem_data.csv'))
+        derived_quantities = self.simulation.get_derived_quantities()
+        sun = self.simulation.get_body('Sun')
+        masses = np.array([celestial_body.mass for celestial_body in self.simulation.celestial_bodies])
+
+        for i, celestial_body in enumerate(self.simulation.celestial_bodies):
+            np.testing.assert_array_equal(derived_quantities.heliocentric_positions[i],
+                                          celestial_body.position - sun.position)
+            np.testing.assert_allclose(derived_quantities.distances_to_sun[i], celestial_body.distance_to_sun(sun),
+                                       rtol=1e-12)
+            np.testing.assert_allclose(derived_quantities.speeds[i], celestial_body.velocity_norm(), rtol=1e-12)
+        np.testing.assert_allclose(masses @ derived_quantities.barycentric_positions, 0,
+                                   atol=1e-12 * masses.sum() * config.AU)
+
+    def test_get_derived_quantities_is_cached_until_the_simulation_is_stepped(self):
+        derived_quantities = self.simulation.get_derived_quantities()
+        self.assertIs(self.simulation.get_derived_quantities(), derived_quantities)
+
+        self.simulation.update_planet_positions(1e6)
+        stepped_quantities = self.simulation.get_derived_quantities()
+        self.assertIsNot(stepped_quantities, derived_quantities)
+        np.testing.assert_array_equal(stepped_quantities.positions[0], self.simulation.celestial_bodies[0].position)
+
+        self.simulation.celestial_bodies = self.simulation.celestial_bodies[1:]
+        self.assertEqual(len(self.simulation.get_derived_quantities().positions),
+                         len(self.simulation.celestial_bodies))
+
+    def test_get_derived_quantities_is_cleared_by_the_step_helpers(self):
+        forces = self.simulation.calculate_forces()
+        for update in (lambda: self.simulation.update_planet_velocity(forces, 1e6),
+                       lambda: self.simulation.update_planet_position(1e6)):
+            derived_quantities = self.simulation.get_derived_quantities()
+            update()
+            updated_quantities = self.simulation.get_derived_quantities()
+            self.assertIsNot(updated_quantities, derived_quantities)
+            np.testing.assert_array_equal(updated_quantities.positions[0], self.simulation.celestial_bodies[0].position)
+            np.testing.assert_array_equal(updated_quantities.velocities[0], self.simulation.celestial_bodies[0].velocity)
+
+    def test_get_distance_to_sun_uses_the_sun_of_each_simulation(self):
+        simulations = [Simulation(), Simulation()]
+        for simulation in simulations:
+            simulation.celestial_bodies = create_celestial_bodies(get_path('solsystem_data.csv'))
+        simulations[1].get_body('Sun').position += np.array([config.AU, 0])
+
+        uranus_position = simulations[1].get_planet_position('Uranus')
+        sun_position = simulations[1].get_planet_position('Sun')
+        np.testing.assert_allclose(simulations[1].get_distance_to_sun('Uranus'),
+                                   np.linalg.norm(uranus_position - sun_position), rtol=1e-12)
+        self.assertNotAlmostEqual(simulations[0].get_distance_to_sun('Uranus'),
+                                  simulations[1].get_distance_to_sun('Uranus'))
+        self.assertIsNone(simulations[0].get_distance_to_sun('Nemesis'))